@@ -2,5 +2,6 @@
 
 from . import agent
 root_agent = agent.root_agent
+app = agent.app
 
-__all__ = ['root_agent']
+__all__ = ['root_agent', 'app']
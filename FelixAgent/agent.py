@@ -1,235 +1,274 @@
 from google.adk.agents import LlmAgent
 from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import FunctionTool
+from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.tool_context import ToolContext
-from typing import Optional, Dict, Any
+import re
+from typing import Any, Dict, Final, List, Optional
+from google.genai import types
 from .send_money_agent import (
     collect_transfer_details,
+    get_transfer_summary,
+    lookup_currency,
     send_money,
 )
 
 #MODEL = "gemini-2.0-flash-exp"
 MODEL = "gemini-2.5-flash"
-# Store tool responses to use them directly instead of LLM processing
-# We use a simple approach: store the last tool response and use it in after_model_callback
-_last_tool_response = None
+# Store tool responses to use them directly instead of LLM processing.
+# Pending responses live in session state (not a module global) so concurrent
+# sessions never see each other's tool output. It is a list because one model turn
+# can make several (parallel) tool calls. The "temp:" prefix keeps it out of
+# persisted state; it only lives for the current invocation.
+_PENDING_TOOL_RESPONSES_KEY = "temp:pending_tool_responses"
 
-def after_tool_callback(*, tool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+# Tool responses that are just a follow-up question start with one of these.
+# Questions like "How much would you like to send?" should be handled by the LLM
+# normally to avoid infinite loops where the agent calls the tool repeatedly.
+_QUESTION_RE = re.compile(
+    r'^\s*(?:how much|how would|what|which|who is|please provide|'
+    r'would you like|do you want|can you|could you)',
+    re.IGNORECASE,
+)
+
+# Tools whose responses are complete, user-facing messages
+_INTERCEPT_TOOLS = frozenset({'collect_transfer_details', 'send_money'})
+
+# Pure greetings and bare "send money" requests never need a tool or the LLM:
+# the instruction tells the model to answer them with this exact reply.
+# Anything with more content (a name, an amount, ...) still goes to the LLM.
+_GREETING_REPLY = (
+    "Hi! I can help you send money. I'll need several details to process the transfer, "
+    "and we'll go step by step. Let's start with the beneficiary's full name and account number."
+)
+_GREETING = r"(?:hi|hello|hey|hola|good (?:morning|afternoon|evening))"
+_SEND_MONEY = r"(?:(?:i want to|i'd like to|i would like to|can you help me|help me|please)\s+)?send money"
+_GREETING_RE = re.compile(
+    rf"^\s*(?:{_GREETING}(?:[\s,!.]+{_SEND_MONEY})?|{_SEND_MONEY})[\s!.?]*$",
+    re.IGNORECASE,
+)
+
+def after_tool_callback(*, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Store tool responses so we can use them directly instead of LLM processing.
     This runs AFTER the tool executes but BEFORE the LLM processes it.
     """
-    # Get the tool name
-    if hasattr(tool, '__name__'):
-        tool_name = tool.__name__
-    elif hasattr(tool, 'name'):
-        tool_name = tool.name
-    else:
-        tool_name = str(tool)
+    # Get the tool name - ADK passes a BaseTool (which has .name); plain functions have __name__
+    tool_name = getattr(tool, 'name', None) or getattr(tool, '__name__', None) or str(tool)
     
     # Check if this is one of our tools that returns a complete response
-    if tool_name in ['collect_transfer_details', 'send_money']:
+    if tool_name in _INTERCEPT_TOOLS:
         # Extract the result from the response
         tool_result = tool_response.get('result', '') if isinstance(tool_response, dict) else str(tool_response)
         
-        # Only intercept tool responses that are NOT just questions
-        # Questions like "How much would you like to send?" should be handled by the LLM normally
-        # to avoid infinite loops where the agent calls the tool repeatedly
-        question_indicators = [
-            'how much', 'how would', 'what', 'which', 'who is', 'please provide',
-            'would you like', 'do you want', 'can you', 'could you'
-        ]
-        tool_result_lower = str(tool_result).lower()
-        
-        # If the tool response is just a question (starts with question indicators), 
+        # Only intercept tool responses that are NOT just questions.
+        # If the tool response is just a question (starts with question indicators),
         # don't intercept it - let the LLM handle it normally
-        is_just_question = any(tool_result_lower.strip().startswith(indicator) for indicator in question_indicators)
+        is_just_question = _QUESTION_RE.match(str(tool_result)) is not None
         
         if not is_just_question:
-            # Store the tool result globally (simple approach - we'll use it in after_model_callback)
-            global _last_tool_response
-            _last_tool_response = tool_result
+            # Stash the tool result for this invocation - we'll use it in before_model_callback.
+            # Assign a new list (rather than appending in place) so ADK records the state change
+            pending = tool_context.state.get(_PENDING_TOOL_RESPONSES_KEY) or []
+            tool_context.state[_PENDING_TOOL_RESPONSES_KEY] = pending + [tool_result]
     
     return tool_response
 
 
-def after_model_callback(*, callback_context: CallbackContext, llm_response) -> Optional:
+def _text_response(texts: List[str]) -> LlmResponse:
+    """Build a model response with one text part per message."""
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text) for text in texts]))
+
+
+def _is_greeting(content: Optional[types.Content]) -> bool:
+    """Check whether the user's message is just a greeting or a bare 'send money'."""
+    if content is None or not content.parts:
+        return False
+    text = ''.join(part.text for part in content.parts if part.text)
+    return _GREETING_RE.match(text) is not None
+
+
+def before_model_callback(*, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
     """
-    Intercept model responses and replace them with tool responses when available.
-    This runs AFTER the LLM generates a response.
+    Answer with the pending tool responses (or a canned greeting) instead of calling the LLM.
+    This runs BEFORE the LLM is called to process the tool result.
     
     Why we need both callbacks:
     - after_tool_callback: Captures the tool response (runs after tool, before LLM)
-    - after_model_callback: Replaces LLM response with tool response (runs after LLM)
+    - before_model_callback: Returns the tool responses as the model's answer, so ADK skips the LLM call
     
-    ADK's flow: Tool → after_tool_callback → LLM processes → after_model_callback → Final response
-    We intercept at both points to ensure the tool response is used verbatim.
+    ADK's flow: Tool(s) → after_tool_callback → before_model_callback → Final response
+    Tool responses are used verbatim, one part each (so none are dropped when a turn
+    makes several tool calls), and the extra LLM round-trip that used to paraphrase
+    them (only to be overwritten) is never made.
     """
-    global _last_tool_response
+    # Most conversational turns have no pending tool response - return right away
+    # and let ADK call the LLM as usual, unless the user only said hello before
+    # any transfer details were collected
+    tool_results = callback_context.state.get(_PENDING_TOOL_RESPONSES_KEY)
+    if not tool_results:
+        if (_is_greeting(callback_context.user_content) and
+                all(value is None for value in get_transfer_summary(callback_context).values())):
+            return _text_response([_GREETING_REPLY])
+        return None
     
-    # If we have a stored tool response, use it instead of the LLM's response
-    if _last_tool_response is not None:
-        tool_result = _last_tool_response
-        _last_tool_response = None  # Clear it after use
-        
-        # Replace the llm_response content with our tool result
-        # We need to replace the entire part to avoid oneof conflicts (data vs text)
-        try:
-            if hasattr(llm_response, 'content') and llm_response.content is not None:
-                if hasattr(llm_response.content, 'parts') and llm_response.content.parts:
-                    part = llm_response.content.parts[0]
-                    
-                    # Check if part has 'data' field set - if so, we must replace the entire part
-                    # to avoid oneof conflict (can't have both 'data' and 'text' set)
-                    has_data = False
-                    if isinstance(part, dict):
-                        has_data = 'data' in part and part.get('data') is not None
-                    elif hasattr(part, 'data'):
-                        try:
-                            has_data = part.data is not None
-                        except:
-                            pass
-                    
-                    # If data is set, replace the entire part to avoid oneof conflict
-                    if has_data:
-                        # Replace with a new part containing only text
-                        llm_response.content.parts[0] = {'text': tool_result}
-                    elif isinstance(part, dict):
-                        # It's a dict without data, replace it entirely
-                        llm_response.content.parts[0] = {'text': tool_result}
-                    else:
-                        # It's a protobuf-like object, try to clear data first, then set text
-                        if hasattr(part, 'data'):
-                            # Try to clear via ClearField (protobuf method)
-                            if hasattr(part, 'ClearField'):
-                                try:
-                                    part.ClearField('data')
-                                except:
-                                    pass
-                            # Also try setting to None
-                            try:
-                                part.data = None
-                            except:
-                                pass
-                        # Now set the text field
-                        if hasattr(part, 'text'):
-                            try:
-                                part.text = tool_result
-                            except:
-                                # If setting text fails, replace the part
-                                llm_response.content.parts[0] = {'text': tool_result}
-                        else:
-                            # Can't set text, replace the part
-                            llm_response.content.parts[0] = {'text': tool_result}
-                else:
-                    # If no parts, create parts list
-                    llm_response.content.parts = [{'text': tool_result}]
-        except Exception as e:
-            # If modification fails, log but don't crash
-            # The original response will be used
-            pass
+    # Clear them after use (ADK's State has no pop/del, so reset to None)
+    callback_context.state[_PENDING_TOOL_RESPONSES_KEY] = None
     
-    # Return the (possibly modified) llm_response object
-    return llm_response
+    return _text_response(tool_results)
+
+
+# The instruction is split in two:
+# - _STATIC_INSTRUCTION: rules, examples and tool descriptions. Built once at import
+#   and shared by every LlmAgent built from this module; keeping the exact same bytes
+#   each time is what lets the context cache fingerprint match across requests.
+# - _DYNAMIC_INSTRUCTION: small per-deployment tweaks (tenant, locale, ...), empty by
+#   default. It is sent after the cached prefix, so changing it never invalidates the
+#   cache. It may use ADK {state_key} placeholders.
+_STATIC_INSTRUCTION: Final[str] = (
+    "You are a helpful and friendly assistant that helps users send money. "
+    "Be natural, conversational, and human-like in your interactions.\n\n"
+    "YOUR ROLE:\n"
+    "Collect the following information in a natural, conversational way: "
+    "1. Amount to send\n"
+    "2. Currency (e.g., USD, EUR, GBP)\n"
+    "3. Beneficiary account number (the recipient's account - primary identifier)\n"
+    "4. Beneficiary name (optional, attached to account - can be looked up from contacts)\n"
+    "5. Destination country\n"
+    "6. Delivery method (Bank Transfer, Mobile Wallet, Cash Pickup, or Card)\n\n"
+    "CRITICAL: WHEN TO USE TOOLS\n"
+    "DO NOT call ANY tools (including collect_transfer_details) for:\n"
+    "- Pure greetings (just 'hello', 'hi')\n"
+    "- General requests like 'send money', 'I want to send money', 'help me send money'\n"
+    "- Vague requests that mention ONLY a name without other details:\n"
+    "  * 'send money to john' - TOO VAGUE (no amount, no account, no country)\n"
+    "  * 'I want to send money to john' - TOO VAGUE (no amount, no account, no country)\n"
+    "  * 'send 100 to john' - TOO VAGUE (no account number, no country, no currency)\n"
+    "  * 'send money to someone' - TOO VAGUE\n"
+    "- Any message that does NOT contain MULTIPLE SPECIFIC transfer details (you need at least 2-3 clear pieces of information)\n"
+    "- Casual conversation with no transfer information\n\n"
+    "IMPORTANT: A request with ONLY a name (like 'I want to send money to john') is TOO VAGUE. "
+    "You need MULTIPLE pieces of information before calling collect_transfer_details:\n"
+    "- At minimum: amount + beneficiary name/account + country, OR\n"
+    "- At minimum: amount + currency + beneficiary account, OR\n"
+    "- Other combinations with at least 2-3 clear details\n\n"
+    "If a request only has ONE piece of information (just a name, or just an amount, or just 'send money'), "
+    "DO NOT call collect_transfer_details. Instead, respond conversationally and ask for more specific information.\n\n"
+    "For greetings or vague/general requests, respond conversationally WITHOUT calling any tools. "
+    "Say something like: 'Hi! I can help you send money. I'll need several details to process the transfer, and we'll go step by step. "
+    "Let's start with the beneficiary's full name and account number.'\n\n"
+    "ONLY call collect_transfer_details when the user's message contains MULTIPLE CLEAR, SPECIFIC transfer details:\n"
+    "You need AT LEAST 2-3 of these pieces of information:\n"
+    "- Amount (e.g., 'send $100', 'I want to send 500', '200 dollars')\n"
+    "- Currency (e.g., 'USD', 'MXN', 'pesos', 'dollars', 'quetzales', 'lempiras')\n"
+    "- Beneficiary name AND account number (e.g., 'John Smith AC123456', 'account ACC-123456', 'Daniela Varela 203933773')\n"
+    "- Country (e.g., 'Mexico', 'Honduras', 'Colombia', 'Guatemala', 'Nicaragua', 'El Salvador', 'República Dominicana')\n"
+    "- Delivery method (e.g., 'bank transfer', 'mobile wallet', 'card')\n\n"
+    "EXAMPLES of when to CALL the tool:\n"
+    "- 'Send $500 USD to John Smith AC123456 in Colombia' - has amount, currency, name, account, country\n"
+    "- 'I want to send 200 dollars to account AC987654 in Mexico' - has amount, currency, account, country\n"
+    "- 'Send $100 to Daniela Varela 203933773 in Colombia via Card' - has amount, name, account, country, method\n\n"
+    "EXAMPLES of when NOT to call the tool (respond conversationally instead):\n"
+    "- 'I want to send money to john' - only has a name, too vague\n"
+    "- 'Send $100' - only has amount, need more info\n"
+    "- 'Send money' - no specific details\n"
+    "- 'Send to John' - only has a name, too vague\n\n"
+    "IMPORTANT: If the user just says 'send money' or greets you, DO NOT call collect_transfer_details. "
+    "Just respond conversationally and guide them to provide the first piece of information.\n\n"
+    "IMPORTANT: If a message contains BOTH a greeting AND transfer information, call collect_transfer_details "
+    "to capture the information immediately. For example, 'Hi, I want to send $200 to John' - call the tool!\n\n"
+    "TOOL DESCRIPTIONS:\n"
+    "- collect_transfer_details: Use when user provides transfer information. "
+    "If multiple contacts match a name, this tool will show options and ask 'Which one?'. "
+    "The user's next response (e.g., 'the first one', '1', or a full name) will be handled automatically. "
+    "This tool automatically shows collected information at each step, so you don't need to call it just to show a summary.\n"
+    "- send_money: Use when user confirms they want to send the money (after all info is collected)\n"
+    "- lookup_currency: Use when you need to know which currency a destination country uses, "
+    "or whether a country is supported\n\n"
+    "CRITICAL: TOOL RESPONSES\n"
+    "When collect_transfer_details returns a response, USE IT VERBATIM. Do NOT paraphrase, summarize, or modify it. "
+    "The tool response already includes:\n"
+    "- A formatted list of collected information (e.g., 'Here's what I have so far: - **Beneficiary:** ...')\n"
+    "- The next question to ask\n"
+    "Simply return the tool's response exactly as provided. Do not add your own interpretation or additional text.\n\n"
+    "CONVERSATION STYLE:\n"
+    "- Respond naturally to greetings without calling tools\n"
+    "- Be friendly and conversational\n"
+    "- When someone says 'hello', 'hi', 'send money', or 'I want to send money', greet them back and explain you can help. "
+    "Then proactively say: 'I'll need several details to process the transfer, and we'll go step by step. "
+    "Let's start with the beneficiary's full name and account number.' "
+    "DO NOT call collect_transfer_details for these messages - just respond conversationally.\n"
+    "- Only use tools when you detect actual transfer information in their message\n"
+    "- When collect_transfer_details shows contact options, just wait for the user's selection - no need to call another tool\n"
+    "- When all information is collected, offer to send the money using the send_money tool\n"
+    "- Guide the conversation naturally toward collecting the needed information\n"
+    "- If the user provides invalid values (wrong country, currency, or delivery method), the tool will guide them with the correct format - "
+    "just continue the conversation naturally\n"
+    "- If the user uses inappropriate language, profanity, or becomes abusive, politely end the conversation with: "
+    "'I apologize, but I'm not able to continue this conversation. Please contact our customer service team for assistance. Have a good day!'\n\n"
+    "Remember: Think like a human assistant. If someone just says 'hi', you say 'hi' back and ask how you can help with the money transfer. "
+    "You don't need to call a tool to have a conversation!"
+)
+_DYNAMIC_INSTRUCTION: Final[str] = ""
+
+
+
+class _FrozenFunctionTool(FunctionTool):
+    """FunctionTool that derives its declaration once instead of on every LLM request.
+
+    FunctionTool rebuilds the declaration from the function signature and docstring
+    each time it is added to a request; ours never change at runtime.
+    """
+
+    def __init__(self, func):
+        super().__init__(func)
+        self._declaration: Optional[types.FunctionDeclaration] = None
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        if self._declaration is None:
+            self._declaration = super()._get_declaration()
+        return self._declaration
+
+
+# Wrapped once at import; passing plain functions would make ADK wrap them in new
+# FunctionTools (and re-derive their schemas) on every request
+_TOOLS: Final = (
+    _FrozenFunctionTool(collect_transfer_details),
+    _FrozenFunctionTool(send_money),
+    _FrozenFunctionTool(lookup_currency),
+)
 
 
 root_agent = LlmAgent(
         name="send_money_agent",
         model=MODEL, 
         description="Agent to help users send money.",
-        instruction=(
-            "You are a helpful and friendly assistant that helps users send money. "
-            "Be natural, conversational, and human-like in your interactions.\n\n"
-            "YOUR ROLE:\n"
-            "Collect the following information in a natural, conversational way: "
-            "1. Amount to send\n"
-            "2. Currency (e.g., USD, EUR, GBP)\n"
-            "3. Beneficiary account number (the recipient's account - primary identifier)\n"
-            "4. Beneficiary name (optional, attached to account - can be looked up from contacts)\n"
-            "5. Destination country\n"
-            "6. Delivery method (Bank Transfer, Mobile Wallet, Cash Pickup, or Card)\n\n"
-            "CRITICAL: WHEN TO USE TOOLS\n"
-            "DO NOT call ANY tools (including collect_transfer_details) for:\n"
-            "- Pure greetings (just 'hello', 'hi')\n"
-            "- General requests like 'send money', 'I want to send money', 'help me send money'\n"
-            "- Vague requests that mention ONLY a name without other details:\n"
-            "  * 'send money to john' - TOO VAGUE (no amount, no account, no country)\n"
-            "  * 'I want to send money to john' - TOO VAGUE (no amount, no account, no country)\n"
-            "  * 'send 100 to john' - TOO VAGUE (no account number, no country, no currency)\n"
-            "  * 'send money to someone' - TOO VAGUE\n"
-            "- Any message that does NOT contain MULTIPLE SPECIFIC transfer details (you need at least 2-3 clear pieces of information)\n"
-            "- Casual conversation with no transfer information\n\n"
-            "IMPORTANT: A request with ONLY a name (like 'I want to send money to john') is TOO VAGUE. "
-            "You need MULTIPLE pieces of information before calling collect_transfer_details:\n"
-            "- At minimum: amount + beneficiary name/account + country, OR\n"
-            "- At minimum: amount + currency + beneficiary account, OR\n"
-            "- Other combinations with at least 2-3 clear details\n\n"
-            "If a request only has ONE piece of information (just a name, or just an amount, or just 'send money'), "
-            "DO NOT call collect_transfer_details. Instead, respond conversationally and ask for more specific information.\n\n"
-            "For greetings or vague/general requests, respond conversationally WITHOUT calling any tools. "
-            "Say something like: 'Hi! I can help you send money. I'll need several details to process the transfer, and we'll go step by step. "
-            "Let's start with the beneficiary's full name and account number.'\n\n"
-            "ONLY call collect_transfer_details when the user's message contains MULTIPLE CLEAR, SPECIFIC transfer details:\n"
-            "You need AT LEAST 2-3 of these pieces of information:\n"
-            "- Amount (e.g., 'send $100', 'I want to send 500', '200 dollars')\n"
-            "- Currency (e.g., 'USD', 'MXN', 'pesos', 'dollars', 'quetzales', 'lempiras')\n"
-            "- Beneficiary name AND account number (e.g., 'John Smith AC123456', 'account ACC-123456', 'Daniela Varela 203933773')\n"
-            "- Country (e.g., 'Mexico', 'Honduras', 'Colombia', 'Guatemala', 'Nicaragua', 'El Salvador', 'República Dominicana')\n"
-            "- Delivery method (e.g., 'bank transfer', 'mobile wallet', 'card')\n\n"
-            "EXAMPLES of when to CALL the tool:\n"
-            "- 'Send $500 USD to John Smith AC123456 in Colombia' - has amount, currency, name, account, country\n"
-            "- 'I want to send 200 dollars to account AC987654 in Mexico' - has amount, currency, account, country\n"
-            "- 'Send $100 to Daniela Varela 203933773 in Colombia via Card' - has amount, name, account, country, method\n\n"
-            "EXAMPLES of when NOT to call the tool (respond conversationally instead):\n"
-            "- 'I want to send money to john' - only has a name, too vague\n"
-            "- 'Send $100' - only has amount, need more info\n"
-            "- 'Send money' - no specific details\n"
-            "- 'Send to John' - only has a name, too vague\n\n"
-            "IMPORTANT: If the user just says 'send money' or greets you, DO NOT call collect_transfer_details. "
-            "Just respond conversationally and guide them to provide the first piece of information.\n\n"
-            "SUPPORTED COUNTRIES AND CURRENCIES:\n"
-            "- MEXICO → MXN (Mexican Peso / Pesos Mexicanos)\n"
-            "- HONDURAS → HNL (Honduran Lempira / Lempiras)\n"
-            "- REPUBLICA DOMINICANA / DOMINICAN REPUBLIC → DOP (Dominican Peso / Pesos Dominicanos)\n"
-            "- NICARAGUA → NIO (Nicaraguan Córdoba / Córdobas)\n"
-            "- COLOMBIA → COP (Colombian Peso / Pesos Colombianos)\n"
-            "- EL SALVADOR → USD (US Dollar / Dólares)\n"
-            "- GUATEMALA → GTQ (Guatemalan Quetzal / Quetzales)\n\n"
-            "IMPORTANT: If a message contains BOTH a greeting AND transfer information, call collect_transfer_details "
-            "to capture the information immediately. For example, 'Hi, I want to send $200 to John' - call the tool!\n\n"
-            "TOOL DESCRIPTIONS:\n"
-            "- collect_transfer_details: Use when user provides transfer information. "
-            "If multiple contacts match a name, this tool will show options and ask 'Which one?'. "
-            "The user's next response (e.g., 'the first one', '1', or a full name) will be handled automatically. "
-            "This tool automatically shows collected information at each step, so you don't need to call it just to show a summary.\n"
-            "- send_money: Use when user confirms they want to send the money (after all info is collected)\n\n"
-            "CRITICAL: TOOL RESPONSES\n"
-            "When collect_transfer_details returns a response, USE IT VERBATIM. Do NOT paraphrase, summarize, or modify it. "
-            "The tool response already includes:\n"
-            "- A formatted list of collected information (e.g., 'Here's what I have so far: - **Beneficiary:** ...')\n"
-            "- The next question to ask\n"
-            "Simply return the tool's response exactly as provided. Do not add your own interpretation or additional text.\n\n"
-            "CONVERSATION STYLE:\n"
-            "- Respond naturally to greetings without calling tools\n"
-            "- Be friendly and conversational\n"
-            "- When someone says 'hello', 'hi', 'send money', or 'I want to send money', greet them back and explain you can help. "
-            "Then proactively say: 'I'll need several details to process the transfer, and we'll go step by step. "
-            "Let's start with the beneficiary's full name and account number.' "
-            "DO NOT call collect_transfer_details for these messages - just respond conversationally.\n"
-            "- Only use tools when you detect actual transfer information in their message\n"
-            "- When collect_transfer_details shows contact options, just wait for the user's selection - no need to call another tool\n"
-            "- When all information is collected, offer to send the money using the send_money tool\n"
-            "- Guide the conversation naturally toward collecting the needed information\n"
-            "- If the user provides invalid values (wrong country, currency, or delivery method), the tool will guide them with the correct format - "
-            "just continue the conversation naturally\n"
-            "- If the user uses inappropriate language, profanity, or becomes abusive, politely end the conversation with: "
-            "'I apologize, but I'm not able to continue this conversation. Please contact our customer service team for assistance. Have a good day!'\n\n"
-            "Remember: Think like a human assistant. If someone just says 'hi', you say 'hi' back and ask how you can help with the money transfer. "
-            "You don't need to call a tool to have a conversation!"
-        ),
-        tools=[
-            collect_transfer_details,
-            send_money
-        ],
+        # The static instruction never changes between turns: ADK places it first in
+        # the request, where Gemini's context cache (configured on the App below) can
+        # reuse it. The dynamic instruction is appended after it (nothing when empty).
+        static_instruction=_STATIC_INSTRUCTION,
+        instruction=_DYNAMIC_INSTRUCTION,
+        # ADK already runs parallel function calls from one model turn concurrently
+        # (asyncio.gather) and merges their responses into a single event. Both tools
+        # are fast in-memory functions, so they stay synchronous.
+        tools=list(_TOOLS),
         after_tool_callback=after_tool_callback,
-        after_model_callback=after_model_callback
-    )
\ No newline at end of file
+        before_model_callback=before_model_callback
+    )
+
+# ADK discovers `app` before `root_agent`; the App carries the context cache
+# config so the static instruction and tool schemas are cached instead of being
+# re-sent as input tokens on every turn. ADK's GeminiContextCacheManager
+# recreates the cache when it expires or after `cache_intervals` invocations.
+app = App(
+    name="FelixAgent",
+    root_agent=root_agent,
+    context_cache_config=ContextCacheConfig(
+        min_tokens=1024,   # Gemini's minimum cacheable prompt size
+        ttl_seconds=1800,
+        cache_intervals=10,
+    ),
+)
@@ -1,5 +1,8 @@
 """Send Money Agent using Google ADK Framework (ADK 1.18)."""
 
+import random
+import re
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from google.adk.tools.tool_context import ToolContext
 
@@ -7,11 +10,57 @@ from .send_money_state import SendMoneyState
 from .utils import (
     extract_amount, extract_currency, extract_country,
     extract_beneficiary_name, extract_account_number, extract_delivery_method,
-    get_expected_formats, COUNTRY_CURRENCY_MAP,
+    get_expected_formats, COUNTRY_CURRENCY_MAP, COUNTRY_NAMES,
     validate_country_value, validate_currency_value, validate_delivery_method_value,
-    detect_correction
+    detect_correction, classify_token
 )
 
+# Supported countries as shown to the user; the map is static, so sort it once
+_SORTED_COUNTRIES = ', '.join(sorted(COUNTRY_CURRENCY_MAP.keys()))
+
+# Expected formats never change at runtime, so build them once at import
+_FORMATS = get_expected_formats()
+
+# Next-field questions, fully built at import; only the account question
+# with a known recipient has a {name} left to fill in
+_Q_AMOUNT = "How much would you like to send?"
+_Q_CURRENCY = "What currency would you like to use? (e.g., USD, MXN, COP, HNL, DOP, NIO, GTQ)"
+_Q_ACCOUNT_WITH_NAME_TMPL = "Please provide the account number for {name}. Expected format: " + _FORMATS['beneficiary_account']
+_Q_RECIPIENT = "Who is the recipient? Please provide the beneficiary's name or account number. Account number format: " + _FORMATS['beneficiary_account']
+_Q_COUNTRY = "Which country should the money be sent to? Supported: " + _SORTED_COUNTRIES
+_Q_DELIVERY_METHOD = "How would you like the money to be delivered? (Bank Transfer, Mobile Wallet, Cash Pickup, or Card)"
+_Q_ANYTHING_ELSE = "Is there anything else you'd like to update?"
+
+# Summary and confirmation messages, filled in with format_map from the transfer fields
+# plus a precomputed beneficiary_display (and transaction_id for the confirmation)
+_SUMMARY_TMPL = (
+    "Great, I have everything!\n\n"
+    "**Amount:** {amount} {currency}\n"
+    "**Beneficiary:** {beneficiary_display}\n"
+    "**Country:** {country}\n"
+    "**Delivery Method:** {delivery_method}\n\n"
+    "Would you like to proceed with the transfer?"
+)
+_CONFIRMATION_TMPL = (
+    "✅ ✅ ✅ Transfer Successful!\n\n"
+    "**Transaction ID:** {transaction_id}\n"
+    "**Amount Sent:** {amount} {currency}\n"
+    "**Recipient:** {beneficiary_display}\n"
+    "**Destination:** {country}\n"
+    "**Delivery Method:** {delivery_method}\n\n"
+    "Your money has been sent successfully! The recipient should receive it within 1-3 business days "
+    "depending on the delivery method.\n\n"
+    "Thank you for using our service!"
+)
+
+# Phrases that mean an extracted "name" is really part of the request, not a person
+_INVALID_NAME_PHRASES = [
+    'send money', 'send money to', 'send to', 'money to', 'want to send',
+    'help me send', 'i want to', 'would like to', 'need to send', 'to send'
+]
+# One compiled alternation scans the name once instead of once per phrase
+_INVALID_NAME_RE = re.compile('|'.join(map(re.escape, _INVALID_NAME_PHRASES)))
+
 
 def _get_state_from_context(tool_context: ToolContext) -> Dict[str, Any]:
     """Get state from ADK's ToolContext (session state).
@@ -60,19 +109,34 @@ def _state_to_send_money_state(state_dict: Dict[str, Any]) -> SendMoneyState:
     )
 
 
-def _send_money_state_to_dict(state: SendMoneyState) -> Dict[str, Any]:
-    """Convert SendMoneyState object to dictionary for storage.
-    
-    Always includes all fields (even if None) so the UI can display the full state structure.
-    """
-    return {
-        'amount': state.amount,
-        'currency': state.currency,
-        'beneficiary_account': state.beneficiary_account,
-        'beneficiary_name': state.beneficiary_name,
-        'country': state.country,
-        'delivery_method': state.delivery_method,
-    }
+# Fields that make up the transfer state, in storage order
+_STATE_FIELDS = ('amount', 'currency', 'beneficiary_account', 'beneficiary_name', 'country', 'delivery_method')
+
+
+# Extractor used to re-read each field when the user corrects it
+_FIELD_EXTRACTORS = {
+    "amount": extract_amount,
+    "currency": extract_currency,
+    "country": extract_country,
+    "beneficiary_name": extract_beneficiary_name,
+    "beneficiary_account": extract_account_number,
+    "delivery_method": extract_delivery_method
+}
+
+# Fields that must be present before a transfer can be sent
+_REQUIRED_FIELDS = ('amount', 'currency', 'beneficiary_account', 'country', 'delivery_method')
+
+
+def _is_complete(state_dict: Dict[str, Any]) -> bool:
+    """Check if all required fields are collected in a state dict."""
+    return all(state_dict.get(field) is not None for field in _REQUIRED_FIELDS)
+
+
+class _DetachedToolContext:
+    """Minimal stand-in for ToolContext that only carries a plain-dict state."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.state = state
 
 
 def collect_transfer_details(tool_context: ToolContext, user_input: str) -> str:
@@ -86,175 +150,138 @@ def collect_transfer_details(tool_context: ToolContext, user_input: str) -> str:
     - Ambiguity handling via separate tool
     - Natural step-by-step prompts
     """
-    # Load state
     state_dict = _get_state_from_context(tool_context)
-    state = _state_to_send_money_state(state_dict)
-    text = user_input.strip().lower()
+    snapshot = tuple(state_dict.get(field) for field in _STATE_FIELDS)
+    # Leading/trailing whitespace never changes what gets extracted, so strip it
+    # before the cache lookup to let equivalent phrasings share an entry
+    response, new_snapshot = _collect_transfer_details_cached(user_input.strip(), snapshot)
+    _update_state_in_context(tool_context, dict(zip(_STATE_FIELDS, new_snapshot)))
+    return response
+
+
+@lru_cache(maxsize=512)
+def _collect_transfer_details_cached(user_input: str, snapshot: tuple) -> tuple:
+    """Run the slot-filling logic against a detached copy of the state.
+    
+    The outcome depends only on the user input and the current slot values, so it
+    is memoized on exactly those. Repeated turns (retries, re-sent messages, the same
+    opening message across sessions) skip extraction entirely. Returns
+    (response, new_snapshot).
+    """
+    context = _DetachedToolContext(dict(zip(_STATE_FIELDS, snapshot)))
+    response = _collect_transfer_details(context, user_input)
+    return response, tuple(context.state.get(field) for field in _STATE_FIELDS)
+
+
+# Slot table, in extraction order: (field, extractor, accept, validator, error template).
+# `accept` filters out values the extractor over-matches; a value failing `validator`
+# ends the turn with the template filled in with the validator's message.
+_SLOTS = (
+    ('amount', extract_amount, None, None, None),
+    ('currency', extract_currency, None, validate_currency_value,
+     "I'm sorry, but {error}. Please use the expected format: " + _FORMATS['currency'] + ". What currency would you like to use?"),
+    # extract_country only matches actual country names, not currency codes, so it's safe to extract
+    # even when currency is also present in the input
+    ('country', extract_country, None, validate_country_value,
+     "{error} Which country should the money be sent to?"),
+    # Account number - extracted AFTER country; skip it if it looks like a country name
+    ('beneficiary_account', extract_account_number, lambda acct: acct.upper() not in COUNTRY_NAMES, None, None),
+    # Reject names that contain request phrases ("send money to", ...) - not a real name
+    ('beneficiary_name', extract_beneficiary_name, lambda name: not _INVALID_NAME_RE.search(name.lower()), None, None),
+    ('delivery_method', extract_delivery_method, None, validate_delivery_method_value,
+     "I'm sorry, but {error}. Please use one of the supported methods: " + _FORMATS['delivery_method'] + ". How would you like the money to be delivered?"),
+)
+
+
+def _country_guess_error(state_dict: Dict[str, Any], user_input: str) -> Optional[str]:
+    """Return an error if the input looks like an unsupported country, else None."""
+    # Only check for country-like input if:
+    # 1. Country is still missing
+    # 2. No country or currency was extracted from this input (context-aware)
+    # 3. Currency is already collected (if currency is missing, prioritize currency extraction)
+    # 4. No beneficiary name was extracted - if so, don't validate as country
+    if (state_dict.get('country') is not None or state_dict.get('currency') is None or
+            extract_country(user_input) is not None or extract_currency(user_input) is not None):
+        return None
+    # Strip and case-fold once; both forms are reused below
+    stripped = user_input.strip()
+    user_input_upper = stripped.upper()
+    # Only validate as country if:
+    # - It's a single word of letters (most countries are single words, except "EL SALVADOR" and "REPUBLICA DOMINICANA")
+    # - No beneficiary name was extracted (if name was extracted, it's clearly not a country)
+    # - Not already a known country name or currency code
+    if (user_input_upper and
+        classify_token(user_input_upper) is None and
+        user_input_upper.isalpha() and  # Only single words of letters (to avoid matching names like "Mary Johnson")
+        extract_beneficiary_name(user_input) is None):
+        # Try to validate it - this will give us a proper error message
+        is_valid, error_msg = validate_country_value(stripped)
+        if not is_valid:
+            return f"{error_msg} Which country should the money be sent to?"
+    return None
+
+
+def _collect_transfer_details(tool_context: ToolContext, user_input: str) -> str:
+    """Slot-filling logic behind collect_transfer_details."""
+    # Load state - this is the context's own state, so writes below land in it directly
+    state_dict = _get_state_from_context(tool_context)
 
     # --- 1) CORRECTIONS (simple and explicit) ---
     correction_field, correction_value = detect_correction(user_input)
     if correction_field:
         # Try to re-extract the new value using our extractors
-        field_extractors = {
-            "amount": extract_amount,
-            "currency": extract_currency,
-            "country": extract_country,
-            "beneficiary_name": extract_beneficiary_name,
-            "beneficiary_account": extract_account_number,
-            "delivery_method": extract_delivery_method
-        }
-        extractor = field_extractors.get(correction_field)
+        extractor = _FIELD_EXTRACTORS.get(correction_field)
         if extractor:
             new_value = extractor(correction_value or user_input)
             if new_value:
-                state.update_field(correction_field, new_value)
-                _update_state_in_context(tool_context, _send_money_state_to_dict(state))
-                return f"Got it — I updated the {correction_field.replace('_',' ')} to {new_value}. " + _next_missing_question(state)
+                state_dict[correction_field] = new_value
+                return f"Got it — I updated the {correction_field.replace('_',' ')} to {new_value}. " + _next_missing_question(state_dict)
         return f"I understand you want to change the {correction_field}, but I couldn't extract the new value."
 
     # --- 2) EXTRACTION (context-aware, based on what's missing) ---
-    extracted = {}
-    
-    # Determine what field is most likely being provided based on what's missing
-    # Priority: if a field is missing, prioritize extraction for that field
-    missing_fields = []
-    if state.amount is None:
-        missing_fields.append("amount")
-    if state.currency is None:
-        missing_fields.append("currency")
-    if state.beneficiary_account is None:
-        missing_fields.append("beneficiary_account")
-    if state.country is None:
-        missing_fields.append("country")
-    if state.delivery_method is None:
-        missing_fields.append("delivery_method")
-
-    # Amount
-    amt = extract_amount(user_input)
-    if amt and state.amount != amt:
-        extracted["amount"] = amt
-
-    # Currency - prioritize if currency is missing
-    cur = extract_currency(user_input)
-    if cur and state.currency != cur:
-        # Validate currency
-        is_valid, error_msg = validate_currency_value(cur)
-        if not is_valid:
-            formats = get_expected_formats()
-            # Save state before returning error
-            _update_state_in_context(tool_context, _send_money_state_to_dict(state))
-            return f"I'm sorry, but {error_msg}. Please use the expected format: {formats['currency']}. What currency would you like to use?"
-        extracted["currency"] = cur
+    # A lone unknown word while the country is missing is answered as a country guess
+    guess_error = _country_guess_error(state_dict, user_input)
+    if guess_error:
+        return guess_error
 
-    # Country - extract if found
-    # extract_country only matches actual country names, not currency codes, so it's safe to extract
-    # even when currency is also present in the input
-    ctry = extract_country(user_input)
-    if ctry and state.country != ctry:
-        # Validate country
-        is_valid, error_msg = validate_country_value(ctry)
-        if not is_valid:
-            # Save state before returning error
-            _update_state_in_context(tool_context, _send_money_state_to_dict(state))
-            return f"{error_msg} Which country should the money be sent to?"
-        extracted["country"] = ctry
-    elif ctry is None and state.country is None and cur is None:
-        # Only check for country-like input if:
-        # 1. No country was extracted
-        # 2. No currency was extracted in this input (context-aware)
-        # 3. Country is still missing
-        # 4. Currency is NOT currently the missing field (if currency is missing, prioritize currency extraction)
-        # 5. Check if a beneficiary name was extracted - if so, don't validate as country
-        name_check = extract_beneficiary_name(user_input)
-        if "currency" not in missing_fields or state.currency is not None:
-            user_input_upper = user_input.strip().upper()
-            # Only validate as country if:
-            # - It's a single word (most countries are single words, except "EL SALVADOR" and "REPUBLICA DOMINICANA")
-            # - No beneficiary name was extracted (if name was extracted, it's clearly not a country)
-            # - Not a currency code
-            # - Not already in our country map
-            if (user_input_upper and 
-                name_check is None and  # No name was extracted - if name was extracted, don't validate as country
-                user_input_upper not in COUNTRY_CURRENCY_MAP and
-                user_input_upper not in ['USD', 'MXN', 'HNL', 'DOP', 'NIO', 'COP', 'GTQ'] and  # Not a currency code
-                not any(char.isdigit() for char in user_input_upper) and
-                len(user_input_upper.split()) == 1):  # Only single words (to avoid matching names like "Mary Johnson")
-                # Try to validate it - this will give us a proper error message
-                is_valid, error_msg = validate_country_value(user_input.strip())
-                if not is_valid:
-                    # Save state before returning error
-                    _update_state_in_context(tool_context, _send_money_state_to_dict(state))
-                    return f"{error_msg} Which country should the money be sent to?"
-
-    # Account number - extract AFTER country to avoid false matches
-    # Only extract if we haven't already extracted a country that might be confused with an account
-    acct = extract_account_number(user_input)
-    if acct and state.beneficiary_account != acct:
-        # Double-check: if the extracted account looks like a country name, skip it
-        if acct.upper() not in COUNTRY_CURRENCY_MAP:
-            extracted["beneficiary_account"] = acct
-
-    # Beneficiary name
-    name = extract_beneficiary_name(user_input)
-    if name and state.beneficiary_name != name:
-        # Validate that the extracted name is not a common phrase or invalid
-        name_lower = name.lower()
-        invalid_name_phrases = [
-            'send money', 'send money to', 'send to', 'money to', 'want to send',
-            'help me send', 'i want to', 'would like to', 'need to send', 'to send'
-        ]
-        # Reject if the name contains invalid phrases
-        if any(phrase in name_lower for phrase in invalid_name_phrases):
-            # Don't extract this as a name - it's likely a phrase, not a real name
-            pass
-        else:
-            extracted["beneficiary_name"] = name
-
-    # Delivery method
-    dm = extract_delivery_method(user_input)
-    if dm and state.delivery_method != dm:
-        # Validate delivery method
-        is_valid, error_msg = validate_delivery_method_value(dm)
-        if not is_valid:
-            formats = get_expected_formats()
-            # Save state before returning error
-            _update_state_in_context(tool_context, _send_money_state_to_dict(state))
-            return f"I'm sorry, but {error_msg}. Please use one of the supported methods: {formats['delivery_method']}. How would you like the money to be delivered?"
-        extracted["delivery_method"] = dm
+    # Only slots that are still empty are extracted; filled slots change through
+    # the correction branch above, so re-scanning the input for them is wasted work
+    extracted = {}
+    for field, extractor, accept, validator, error_template in _SLOTS:
+        if state_dict.get(field) is not None:
+            continue
+        value = extractor(user_input)
+        if not value or (accept is not None and not accept(value)):
+            continue
+        if validator is not None:
+            is_valid, error_msg = validator(value)
+            if not is_valid:
+                return error_template.format(error=error_msg)
+        extracted[field] = value
 
     # --- 3) If nothing was extracted ---
     if not extracted:
         # Show what we have and ask for the next missing field
-        collected_info = _format_collected_info(state)
-        next_question = _next_missing_question(state)
+        collected_info = _format_collected_info(state_dict)
+        next_question = _next_missing_question(state_dict)
         if collected_info:
             return f"{collected_info}\n\n{next_question}"
         else:
             return next_question
 
     # --- 4) Apply extracted fields ---
-    for field, value in extracted.items():
-        state.update_field(field, value)
-
-    _update_state_in_context(tool_context, _send_money_state_to_dict(state))
+    state_dict.update(extracted)
 
     # --- 5) If complete → summary ---
-    if state.is_complete():
-        summary = state.get_summary()
+    if _is_complete(state_dict):
+        summary = state_dict
         beneficiary_display = f"{summary['beneficiary_name']} (Acct {summary['beneficiary_account']})" if summary.get('beneficiary_name') else f"Acct {summary['beneficiary_account']}"
-        return (
-            "Great, I have everything!\n\n"
-            f"**Amount:** {summary['amount']} {summary['currency']}\n"
-            f"**Beneficiary:** {beneficiary_display}\n"
-            f"**Country:** {summary['country']}\n"
-            f"**Delivery Method:** {summary['delivery_method']}\n\n"
-            "Would you like to proceed with the transfer?"
-        )
+        return _SUMMARY_TMPL.format_map({**summary, 'beneficiary_display': beneficiary_display})
 
     # --- 6) Otherwise → ALWAYS show collected info and ask next question ---
-    # Format collected info - state object has the latest values after update
-    collected_info = _format_collected_info(state)
-    next_question = _next_missing_question(state)
+    # Format collected info - state dict has the latest values after update
+    collected_info = _format_collected_info(state_dict)
+    next_question = _next_missing_question(state_dict)
     
     # ALWAYS show collected info if we have any collected fields, then ask next question
     # This ensures users always see what information has been collected
@@ -264,61 +291,65 @@ def collect_transfer_details(tool_context: ToolContext, user_input: str) -> str:
     return next_question
 
 
-def _format_collected_info(state: SendMoneyState) -> str:
+def _format_collected_info(state: Dict[str, Any]) -> str:
     """Format the currently collected information as a nice list."""
-    collected = []
+    # Lines are built with their "- " bullet already in place, then joined once
+    parts = []
+    amount = state.get('amount')
+    currency = state.get('currency')
+    country = state.get('country')
+    delivery_method = state.get('delivery_method')
     
     # Amount
-    if state.amount is not None and state.currency is not None:
-        collected.append(f"**Amount:** {state.amount} {state.currency}")
-    elif state.amount is not None:
-        collected.append(f"**Amount:** {state.amount}")
+    if amount is not None and currency is not None:
+        parts.append(f"- **Amount:** {amount} {currency}")
+    elif amount is not None:
+        parts.append(f"- **Amount:** {amount}")
     
     # Beneficiary - check for both name and account (handle None and empty strings)
     # Use truthiness check: None, empty string, or whitespace-only string are all falsy
-    beneficiary_name = state.beneficiary_name if state.beneficiary_name and state.beneficiary_name.strip() else None
-    beneficiary_account = state.beneficiary_account if state.beneficiary_account and state.beneficiary_account.strip() else None
+    beneficiary_name = state.get('beneficiary_name')
+    beneficiary_name = beneficiary_name if beneficiary_name and beneficiary_name.strip() else None
+    beneficiary_account = state.get('beneficiary_account')
+    beneficiary_account = beneficiary_account if beneficiary_account and beneficiary_account.strip() else None
     
     if beneficiary_name and beneficiary_account:
-        collected.append(f"**Beneficiary:** {beneficiary_name} (Account: {beneficiary_account})")
+        parts.append(f"- **Beneficiary:** {beneficiary_name} (Account: {beneficiary_account})")
     elif beneficiary_name:
-        collected.append(f"**Beneficiary Name:** {beneficiary_name}")
+        parts.append(f"- **Beneficiary Name:** {beneficiary_name}")
     elif beneficiary_account:
-        collected.append(f"**Beneficiary Account:** {beneficiary_account}")
+        parts.append(f"- **Beneficiary Account:** {beneficiary_account}")
     
     # Country
-    if state.country and state.country.strip():
-        collected.append(f"**Country:** {state.country}")
+    if country and country.strip():
+        parts.append(f"- **Country:** {country}")
     
     # Delivery method
-    if state.delivery_method and state.delivery_method.strip():
-        collected.append(f"**Delivery Method:** {state.delivery_method}")
+    if delivery_method and delivery_method.strip():
+        parts.append(f"- **Delivery Method:** {delivery_method}")
     
-    if collected:
-        return "Here's what I have so far:\n" + "\n".join(f"- {item}" for item in collected)
-    return ""
+    return "Here's what I have so far:\n" + "\n".join(parts) if parts else ""
 
 
-def _next_missing_question(state: SendMoneyState) -> str:
+def _next_missing_question(state: Dict[str, Any]) -> str:
     """Generate a natural question for the next missing field."""
-    formats = get_expected_formats()
-    
-    if state.amount is None:
-        return "How much would you like to send?"
-    if state.currency is None:
-        return "What currency would you like to use? (e.g., USD, MXN, COP, HNL, DOP, NIO, GTQ)"
-    if state.beneficiary_account is None:
-        if state.beneficiary_name:
+    if state.get('amount') is None:
+        return _Q_AMOUNT
+    if state.get('currency') is None:
+        return _Q_CURRENCY
+    if state.get('beneficiary_account') is None:
+        beneficiary_name = state.get('beneficiary_name')
+        if beneficiary_name:
             # We have the name, just need the account number
-            return f"Please provide the account number for {state.beneficiary_name}. Expected format: {formats['beneficiary_account']}"
+            return _Q_ACCOUNT_WITH_NAME_TMPL.format(name=beneficiary_name)
         else:
             # No name or account, ask for either
-            return f"Who is the recipient? Please provide the beneficiary's name or account number. Account number format: {formats['beneficiary_account']}"
-    if state.country is None:
-        return f"Which country should the money be sent to? Supported: {', '.join(sorted(COUNTRY_CURRENCY_MAP.keys()))}"
-    if state.delivery_method is None:
-        return "How would you like the money to be delivered? (Bank Transfer, Mobile Wallet, Cash Pickup, or Card)"
-    return "Is there anything else you'd like to update?"
+            return _Q_RECIPIENT
+    if state.get('country') is None:
+        return _Q_COUNTRY
+    if state.get('delivery_method') is None:
+        return _Q_DELIVERY_METHOD
+    return _Q_ANYTHING_ELSE
 
 
 def get_transfer_summary(tool_context: ToolContext) -> Dict[str, Any]:
@@ -336,6 +367,24 @@ def get_transfer_summary(tool_context: ToolContext) -> Dict[str, Any]:
     return state.get_summary()
 
 
+def lookup_currency(country: str) -> str:
+    """
+    Looks up the currency used for transfers to a destination country.
+    
+    Args:
+        country: Destination country name (e.g., "Mexico", "República Dominicana")
+    
+    Returns:
+        The currency for the country, or the list of supported countries if it is not supported
+    """
+    resolved = extract_country(country) or country.strip().upper()
+    currency = COUNTRY_CURRENCY_MAP.get(resolved)
+    if currency is None:
+        _, error_msg = validate_country_value(country.strip())
+        return error_msg
+    return f"Transfers to {resolved} are sent in {currency}."
+
+
 def send_money(tool_context: ToolContext) -> str:
     """
     Sends the money transfer with the collected information.
@@ -350,86 +399,40 @@ def send_money(tool_context: ToolContext) -> str:
     state_dict = _get_state_from_context(tool_context)
     state = _state_to_send_money_state(state_dict)
     
-    # Debug: Log current state for troubleshooting
-    current_state = {
-        'amount': state.amount,
-        'currency': state.currency,
-        'beneficiary_account': state.beneficiary_account,
-        'beneficiary_name': state.beneficiary_name,
-        'country': state.country,
-        'delivery_method': state.delivery_method,
-    }
+    # One snapshot of the collected fields serves both the error and the confirmation
+    summary = state.get_summary()
     
     # Verify all required information is present
     if not state.is_complete():
-        missing = []
-        if state.amount is None:
-            missing.append("amount")
-        if state.currency is None:
-            missing.append("currency")
-        if state.beneficiary_account is None:
-            missing.append("beneficiary account")
-        if state.country is None:
-            missing.append("country")
-        if state.delivery_method is None:
-            missing.append("delivery method")
+        missing = [field.replace('_', ' ') for field in _REQUIRED_FIELDS if summary[field] is None]
         
         # Return detailed error with current state for debugging
         # DO NOT clear state on failure - keep it so user can fix missing fields
         return (
             f"❌ Cannot send transfer yet. Missing information: {', '.join(missing)}.\n\n"
             f"Current information collected:\n"
-            f"- Amount: {current_state.get('amount', 'Not provided')}\n"
-            f"- Currency: {current_state.get('currency', 'Not provided')}\n"
-            f"- Beneficiary Account: {current_state.get('beneficiary_account', 'Not provided')}\n"
-            f"- Beneficiary Name: {current_state.get('beneficiary_name', 'Not provided')}\n"
-            f"- Country: {current_state.get('country', 'Not provided')}\n"
-            f"- Delivery Method: {current_state.get('delivery_method', 'Not provided')}\n\n"
+            f"- Amount: {summary.get('amount', 'Not provided')}\n"
+            f"- Currency: {summary.get('currency', 'Not provided')}\n"
+            f"- Beneficiary Account: {summary.get('beneficiary_account', 'Not provided')}\n"
+            f"- Beneficiary Name: {summary.get('beneficiary_name', 'Not provided')}\n"
+            f"- Country: {summary.get('country', 'Not provided')}\n"
+            f"- Delivery Method: {summary.get('delivery_method', 'Not provided')}\n\n"
             f"Please provide the missing information using collect_transfer_details, then try sending again."
         )
     
     # Generate a fake transaction ID
-    import random
-    transaction_id = f"TXN{random.randint(100000, 999999)}"
+    transaction_id = f"TXN{100000 + random.getrandbits(20) % 900000}"
     
     # Simulate sending the money
-    summary = state.get_summary()
-    
     beneficiary_display = f"{summary['beneficiary_name']} ({summary['beneficiary_account']})" if summary['beneficiary_name'] else summary['beneficiary_account']
-    confirmation_message = (
-        f"✅ ✅ ✅ Transfer Successful!\n\n"
-        f"**Transaction ID:** {transaction_id}\n"
-        f"**Amount Sent:** {summary['amount']} {summary['currency']}\n"
-        f"**Recipient:** {beneficiary_display}\n"
-        f"**Destination:** {summary['country']}\n"
-        f"**Delivery Method:** {summary['delivery_method']}\n\n"
-        f"Your money has been sent successfully! The recipient should receive it within 1-3 business days "
-        f"depending on the delivery method.\n\n"
-        f"Thank you for using our service!"
+    confirmation_message = _CONFIRMATION_TMPL.format_map(
+        {**summary, 'transaction_id': transaction_id, 'beneficiary_display': beneficiary_display}
     )
     
     # Reset state after successful transfer (only if transfer was successful)
-    # Clear state by deleting all keys
+    # ADK's State supports neither pop nor del, so clear the fixed set of transfer
+    # fields by setting them to None - the same shape a new conversation starts from
     if tool_context.state is not None:
-        # State is a dict-like object, clear it by deleting all keys
-        # Get keys safely - State object might not have .keys() method
-        try:
-            # Try to get keys using .keys() method
-            if hasattr(tool_context.state, 'keys'):
-                keys_to_delete = list(tool_context.state.keys())
-            else:
-                # Fallback: use known field names
-                keys_to_delete = ['amount', 'currency', 'beneficiary_account', 'beneficiary_name', 'country', 'delivery_method']
-        except (AttributeError, TypeError):
-            # If .keys() doesn't work, use known field names
-            keys_to_delete = ['amount', 'currency', 'beneficiary_account', 'beneficiary_name', 'country', 'delivery_method']
-        
-        for key in keys_to_delete:
-            try:
-                if key in tool_context.state:
-                    del tool_context.state[key]
-            except (KeyError, AttributeError, TypeError):
-                # Key might not exist or state might not support deletion
-                pass
+        tool_context.state.update(dict.fromkeys(_STATE_FIELDS))
     
     return confirmation_message
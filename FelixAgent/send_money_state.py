@@ -4,9 +4,18 @@ from typing import Optional
 from dataclasses import dataclass
 
 
-@dataclass
+# Fields that update_field is allowed to set
+_ALLOWED_FIELDS = frozenset({
+    'amount', 'currency', 'beneficiary_account', 'beneficiary_name', 'country', 'delivery_method'
+})
+
+
+@dataclass(slots=True)
 class SendMoneyState:
-    """Tracks the state of a money transfer request across multiple turns."""
+    """Tracks the state of a money transfer request across multiple turns.
+    
+    Uses __slots__ (no per-instance __dict__), since one is built for every summary.
+    """
     
     # Required fields
     amount: Optional[float] = None
@@ -18,18 +27,18 @@ class SendMoneyState:
     
     def update_field(self, field_name: str, value: any) -> None:
         """Update a field value."""
-        if field_name in ['amount', 'currency', 'beneficiary_account', 'beneficiary_name', 'country', 'delivery_method']:
+        if field_name in _ALLOWED_FIELDS:
             setattr(self, field_name, value)
     
     def is_complete(self) -> bool:
         """Check if all required fields are collected."""
-        return all([
-            self.amount is not None,
-            self.currency is not None,
-            self.beneficiary_account is not None,
-            self.country is not None,
-            self.delivery_method is not None
-        ])
+        return (
+            self.amount is not None
+            and self.currency is not None
+            and self.beneficiary_account is not None
+            and self.country is not None
+            and self.delivery_method is not None
+        )
     
     def get_summary(self) -> dict:
         """Get a summary of all collected information."""
@@ -1,7 +1,9 @@
 """Utility functions for parsing and validating user input."""
 
 import re
-from typing import Optional, Tuple
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Callable, Literal, Mapping, NamedTuple, Optional, Tuple
 
 
 # Supported countries and their currencies
@@ -27,6 +29,17 @@ CURRENCY_NAMES = {
     'GTQ': ['gtq', 'quetzal', 'quetzales', 'guatemalan quetzal'],
 }
 
+# Upper-case country names and currency codes, for membership checks
+COUNTRY_NAMES = frozenset(COUNTRY_CURRENCY_MAP)
+CURRENCY_CODES = frozenset(CURRENCY_NAMES)
+
+# Supported values as listed in prompts and error messages
+_SUPPORTED_COUNTRIES_STR = ', '.join(sorted(COUNTRY_CURRENCY_MAP))
+_SUPPORTED_CURRENCIES_STR = ', '.join(sorted(set(COUNTRY_CURRENCY_MAP.values())))
+
+# Reverse lookup from each currency name to its code
+_NAME_TO_CODE = {name: code for code, names in CURRENCY_NAMES.items() for name in names}
+
 # Country name variations
 COUNTRY_VARIANTS = {
     'MEXICO': ['mexico', 'méxico', 'mex'],
@@ -38,48 +51,227 @@ COUNTRY_VARIANTS = {
     'GUATEMALA': ['guatemala', 'guate'],
 }
 
+# Delivery method keywords and the method each one names
+_DELIVERY_METHOD_MAP = {
+    'bank transfer': 'Bank Transfer',
+    'wire transfer': 'Bank Transfer',
+    'bank': 'Bank Transfer',
+    'wire': 'Bank Transfer',
+    'mobile wallet': 'Mobile Wallet',
+    'wallet': 'Mobile Wallet',
+    'mobile': 'Mobile Wallet',
+    'cash pickup': 'Cash Pickup',
+    'pickup': 'Cash Pickup',
+    'cash': 'Cash Pickup',
+    'card': 'Card',
+    'debit card': 'Card',
+    'credit card': 'Card'
+}
+
 # Supported delivery methods
-DELIVERY_METHODS = {
-    'bank transfer', 'wire transfer', 'bank', 'wire',
-    'mobile wallet', 'wallet', 'mobile',
-    'cash pickup', 'pickup', 'cash',
-    'card', 'debit card', 'credit card'
+DELIVERY_METHODS = frozenset(_DELIVERY_METHOD_MAP)
+
+# Exact-match lookup of normalized (upper-case) tokens to what they name.
+# Every entry is matched as a whole string, so a hash lookup answers in one
+# step what a prefix trie would need a walk over the token for.
+_TOKEN_KINDS = {
+    **{country: 'country' for country in COUNTRY_NAMES},
+    **{code: 'currency' for code in CURRENCY_CODES},
 }
 
 
+def _trie_pattern(leaves: dict) -> str:
+    """Regex source matching any key of leaves, with shared prefixes factored out.
+    
+    For "mex", "mexico" and "méxico" this gives m(?:ex(?:ico|)|éxico), so the
+    engine compares each prefix once instead of once per alternative. The value
+    for each key is emitted at the point where that key ends.
+    """
+    trie = {}
+    for word, leaf in leaves.items():
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = leaf
+    
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in node.items() if char]
+        if '' in node:
+            branches.append(node[''])
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return emit(trie)
+
+
+def _keyed_alternation(variants_by_key: dict, word_bounded: bool = True) -> Tuple[re.Pattern, dict]:
+    """Compile one alternation over all variants, reporting which key matched.
+    
+    Variants must match as whole words unless word_bounded is False, in which
+    case they match anywhere (like a substring check).
+    
+    The alternation sits in a lookahead, so a single finditer pass reports every
+    position where some variant starts (overlapping ones included). Also returns
+    {group name: (rank, key)} so callers can pick the key that comes first in the
+    mapping, exactly as checking the keys one at a time would.
+    
+    All variants go into one prefix tree, with an empty named group marking where
+    each one ends. That is only exact while no variant is a prefix of another key's
+    variant (so at most one key can match at a position); otherwise each key gets
+    its own group, tried in rank order, with a prefix tree per key.
+    """
+    ranks = {}
+    owners = {}
+    for rank, (key, variants) in enumerate(variants_by_key.items()):
+        ranks[re.sub(r'\W', '_', key)] = (rank, key)
+        for variant in variants:
+            owners.setdefault(variant, key)
+    shared_prefix = any(
+        longer != variant and longer.startswith(variant) and owners[longer] != key
+        for variant, key in owners.items()
+        for longer in owners
+    )
+    if shared_prefix:
+        alternation = '|'.join(
+            f"(?P<{group}>{_trie_pattern(dict.fromkeys(variants_by_key[key], ''))})"
+            for group, (_, key) in ranks.items()
+        )
+    else:
+        leaves = {}
+        for index, (variant, key) in enumerate(owners.items()):
+            group = f'_{index}'
+            leaves[variant] = f'(?P<{group}>)'
+            ranks[group] = ranks[re.sub(r'\W', '_', key)]
+        alternation = _trie_pattern(leaves)
+    boundary = r'\b' if word_bounded else ''
+    return re.compile('(?=' + boundary + '(?:' + alternation + ')' + boundary + ')'), ranks
+
+
+def _first_keyed_match(pattern: re.Pattern, ranks: dict, text: str) -> Optional[str]:
+    """Return the earliest-ranked key with a variant anywhere in text, or None."""
+    hits = [ranks[match.lastgroup] for match in pattern.finditer(text)]
+    return min(hits)[1] if hits else None
+
+
+class _NormalizedText(NamedTuple):
+    """Lower- and upper-cased forms of one input string."""
+    lower: str
+    upper: str
+
+
+@lru_cache(maxsize=512)
+def _normalize(text: str) -> _NormalizedText:
+    """Case-fold text once; every extractor run on the same input shares the result."""
+    return _NormalizedText(text.lower(), text.upper())
+
+
+def _memoized_on(key: Callable[[str], str]):
+    """Memoize a text function (LRU, 1024 entries) on key(text) rather than the raw text.
+    
+    key must only drop differences the function ignores (surrounding whitespace,
+    case), so that equivalent inputs share one cache entry. The wrapper exposes
+    cache_info() and cache_clear() like functools.lru_cache.
+    """
+    def decorator(func):
+        cached = lru_cache(maxsize=1024)(func)
+
+        @wraps(func)
+        def wrapper(text: str):
+            return cached(key(text))
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
+
+
+def _stripped(text: str) -> str:
+    """Cache key for functions that ignore surrounding whitespace."""
+    return text.strip()
+
+
+def _stripped_lower(text: str) -> str:
+    """Cache key for functions that ignore surrounding whitespace and case."""
+    return text.strip().lower()
+
+
+# Any digit; a cheap C-level pre-check before patterns that need one
+_DIGIT_RE = re.compile(r'\d')
+
+# Digits with optional spaces (and hyphens, for accounts), at least one digit; used with
+# fullmatch in place of stripping the separators and calling isdigit()
+_DIGITS_AND_SPACES_RE = re.compile(r' *\d[\d ]*')
+_DIGITS_AND_SEPARATORS_RE = re.compile(r'[- ]*\d[\d -]*')
+
+# "$" amounts and standalone numbers in one alternation. It sits in a lookahead so a
+# single finditer pass sees every start position, as the two separate passes did
+_AMOUNT_RE = re.compile(
+    r'(?=\$\s*(\d+(?:\.\d{1,2})?)'  # $100 or $100.50
+    r'|\b(\d{1,6}(?:\.\d{1,2})?)\b)'  # Standalone number (1-6 digits, optional decimals)
+)
+
+
+# The pure extractors in this module (and detect_correction) are memoized: results are
+# immutable and chat turns are short, so repeated inputs (retries, re-sent corrections)
+# skip the regex scans entirely. Keys drop surrounding whitespace, plus case where the
+# function ignores it, so "Mexico" and " mexico " share one entry.
+
+@_memoized_on(_stripped)
 def extract_amount(text: str) -> Optional[float]:
     """Extract monetary amount from text - simple number extraction."""
-    # Look for numbers - simple patterns
-    patterns = [
-        r'\$\s*(\d+(?:\.\d{1,2})?)',  # $100 or $100.50
-        r'\b(\d{1,6}(?:\.\d{1,2})?)\b',  # Standalone number (1-6 digits, optional decimals)
-    ]
+    # Any "$" amount wins over standalone numbers; otherwise the first standalone number
+    # (non-overlapping, left to right) is used. Reasonable amounts are between 1 and 1,000,000
+    if not _DIGIT_RE.search(text):
+        return None
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            try:
-                amount = float(match.group(1))
-                # Reasonable amount check (between 1 and 1,000,000)
-                if 1 <= amount <= 1000000:
-                    return amount
-            except (ValueError, IndexError):
-                continue
-    return None
+    number_amount = None
+    number_end = 0
+    for match in _AMOUNT_RE.finditer(text):
+        dollar_text, number_text = match.groups()
+        if dollar_text is not None:
+            amount = float(dollar_text)
+            if 1 <= amount <= 1000000:
+                return amount
+        elif number_amount is None and match.start() >= number_end:
+            number_end = match.end(2)
+            amount = float(number_text)
+            if 1 <= amount <= 1000000:
+                number_amount = amount
+    return number_amount
 
 
+# Currency code attached to a number (e.g. "100USD", "100U") and a standalone 3-letter code.
+# The number may only start after a non-digit: the leftmost match never starts mid-number
+# anyway, and without the lookbehind a long run of digits is rescanned from every position.
+# The lookbehind comes after the first digit so the pattern starts with \d, which lets the
+# engine skip ahead to the next digit instead of trying every position
+_ATTACHED_CURRENCY_RE = re.compile(r'\d(?<!\d\d)\d*(?:\.\d{1,2})?([A-Z]{1,3})\b')
+_CURRENCY_CODE_RE = re.compile(r'\b([A-Z]{3})\b')
+
+# All currency names in one alternation, one named group per code
+_CURRENCY_NAME_RE, _CURRENCY_NAME_RANKS = _keyed_alternation(CURRENCY_NAMES)
+
+
+@_memoized_on(_stripped)
 def extract_currency(text: str) -> Optional[str]:
     """Extract currency from text - handles codes attached to numbers (e.g., "100usd", "100U")."""
-    text_lower = text.lower().strip()
-    text_upper = text.upper()
+    normalized = _normalize(text)
+    text_lower = normalized.lower.strip()
+    
+    # Fast path: the whole input is a currency name or code (e.g. "pesos mexicanos", "usd")
+    code = _NAME_TO_CODE.get(text_lower)
+    if code:
+        return code
+    
+    text_upper = normalized.upper
     
     # First, try currency codes directly attached to numbers (e.g., "100usd", "100USD", "100U")
     # Match pattern: number followed by letters (could be full or partial currency)
-    attached_match = re.search(r'\d+(?:\.\d{1,2})?([A-Z]{1,3})\b', text_upper)
+    # (skipped when there is no digit to attach to)
+    attached_match = _ATTACHED_CURRENCY_RE.search(text_upper) if _DIGIT_RE.search(text_upper) else None
     if attached_match:
         letters = attached_match.group(1)
         # Try to match as full currency code first
-        if letters in CURRENCY_NAMES:
+        if letters in CURRENCY_CODES:
             return letters
         # Try partial match - if letters match start of any currency code
         for code in CURRENCY_NAMES.keys():
@@ -87,60 +279,64 @@ def extract_currency(text: str) -> Optional[str]:
                 return code
     
     # Try exact currency code match (3-letter codes with word boundaries)
-    currency_code_match = re.search(r'\b([A-Z]{3})\b', text_upper)
+    currency_code_match = _CURRENCY_CODE_RE.search(text_upper)
     if currency_code_match:
         code = currency_code_match.group(1)
-        if code in CURRENCY_NAMES:
+        if code in CURRENCY_CODES:
             return code
     
-    # Try currency names with word boundaries
-    for code, names in CURRENCY_NAMES.items():
-        for name in names:
-            pattern = r'\b' + re.escape(name) + r'\b'
-            if re.search(pattern, text_lower):
-                return code
-    
-    return None
+    # Try currency names with word boundaries, all in one scan
+    return _first_keyed_match(_CURRENCY_NAME_RE, _CURRENCY_NAME_RANKS, text_lower)
+
 
+# All country variants in one alternation, one named group per country
+_COUNTRY_RE, _COUNTRY_RANKS = _keyed_alternation(COUNTRY_VARIANTS)
 
+
+@_memoized_on(_stripped_lower)
 def extract_country(text: str) -> Optional[str]:
     """Extract country from text using intelligent matching with word boundaries."""
-    text_lower = text.lower().strip()
-    
-    # Try to match country variants with word boundaries
-    for country, variants in COUNTRY_VARIANTS.items():
-        for variant in variants:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(variant) + r'\b'
-            if re.search(pattern, text_lower):
-                return country
+    # Leading/trailing whitespace doesn't affect word-bounded matches, so no strip is needed
+    text_lower = _normalize(text).lower
     
-    return None
+    # Try to match country variants with word boundaries (to avoid partial matches), all in one scan
+    return _first_keyed_match(_COUNTRY_RE, _COUNTRY_RANKS, text_lower)
+
+
+# Every country name as one word-bounded, case-insensitive alternation, stripped before account matching
+_COUNTRIES_STRIP_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, COUNTRY_CURRENCY_MAP)) + r')\b', re.IGNORECASE)
+
+# Account number patterns, in priority order, each with the lower-case keywords one of
+# which must appear for it to match at all (empty: no keyword needed). The order decides
+# which account wins, so patterns that can't match are skipped rather than reordered
+_ACCOUNT_PATTERNS = tuple((re.compile(pattern, re.IGNORECASE), keywords) for pattern, keywords in (
+    (r'(?:account|acc|account number|account#|cuenta|cuenta número)\s*:?\s*([A-Z0-9-]+)', ('acc', 'cuenta')),
+    (r'\b(AC[A-Z0-9]{6,})\b', ('ac',)),  # AC12629233 or AC9Q834982 format - alphanumeric after AC
+    (r'\b(ACC-?[A-Z0-9]{6,})\b', ('acc',)),  # ACC-123456 or ACC123456 or ACC-9Q834982
+    (r'\b([A-Z]{2,4}-?\d{6,})\b', ()),  # Any 2-4 letters followed by 6+ DIGITS (not just alphanumeric)
+    (r'\b(\d{8,})\b', ()),  # Standalone 8+ digit number (likely account)
+))
 
 
 def extract_account_number(text: str) -> Optional[str]:
     """Extract account number from text - handles various formats."""
     # Look for patterns like "ACC-123456", "AC12629233", "AC9Q834982", "account 123456", etc.
+    # Every account number has at least one digit; without one, words like "actually"
+    # or "account is" would be picked up as accounts
+    if not _DIGIT_RE.search(text):
+        return None
+    
     # IMPORTANT: We check for country names first to avoid false matches
     # Extract country first to exclude it from account number matching
-    text_for_account = text
-    
-    # Remove known country names from the text before extracting account numbers
+    # Remove known country names (case-insensitive) from the text before extracting account numbers
     # This prevents "COLOMBIA" from being matched as an account number
-    for country in COUNTRY_CURRENCY_MAP.keys():
-        # Remove country name (case-insensitive) from text
-        text_for_account = re.sub(r'\b' + re.escape(country) + r'\b', '', text_for_account, flags=re.IGNORECASE)
-    
-    patterns = [
-        r'(?:account|acc|account number|account#|cuenta|cuenta número)\s*:?\s*([A-Z0-9-]+)',
-        r'\b(AC[A-Z0-9]{6,})\b',  # AC12629233 or AC9Q834982 format - alphanumeric after AC
-        r'\b(ACC-?[A-Z0-9]{6,})\b',  # ACC-123456 or ACC123456 or ACC-9Q834982
-        r'\b([A-Z]{2,4}-?\d{6,})\b',  # Any 2-4 letters followed by 6+ DIGITS (not just alphanumeric)
-        r'\b(\d{8,})\b',  # Standalone 8+ digit number (likely account)
-    ]
+    text_for_account = _COUNTRIES_STRIP_RE.sub('', text)
+    text_for_account_lower = text_for_account.lower()
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text_for_account, re.IGNORECASE)
+    for pattern, keywords in _ACCOUNT_PATTERNS:
+        if keywords and not any(keyword in text_for_account_lower for keyword in keywords):
+            continue
+        matches = pattern.finditer(text_for_account)
         for match in matches:
             account = match.group(1).strip().upper()
             
@@ -151,73 +347,81 @@ def extract_account_number(text: str) -> Optional[str]:
                 return account
             
             # Handle pure numbers (8+ digits)
-            if len(account) >= 8 and account.replace('-', '').replace(' ', '').isdigit():
+            if len(account) >= 8 and _DIGITS_AND_SEPARATORS_RE.fullmatch(account):
                 # Pure number - format as ACC-XXXXXX
                 return f"ACC-{account.replace('-', '')}"
     
     return None
 
 
+# Common words to exclude from names
+_EXCLUDED_WORDS = frozenset({
+    'the', 'a', 'an', 'hello', 'hi', 'hey', 'hola', 'good', 'morning', 
+    'afternoon', 'evening', 'night', 'thanks', 'thank', 'please', 
+    'yes', 'no', 'ok', 'okay', 'sure', 'alright', 'send', 'money',
+    'dollars', 'pesos', 'usd', 'mxn', 'cop', 'hnl', 'dop', 'nio', 'gtq',
+    'bank', 'transfer', 'card', 'wallet', 'pickup', 'cash', 'mobile',
+    'mexico', 'honduras', 'colombia', 'nicaragua', 'guatemala', 'salvador',
+    'dominican', 'republic', 'change', 'update', 'amount', 'currency',
+    'to', 'for', 'with', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
+    'someone', 'somebody', 'person', 'recipient', 'beneficiary',
+    'actually', 'really', 'just', 'want', 'like', 'need'
+})
+
+# Common phrases that might be mistaken for names
+_EXCLUDED_PHRASES = (
+    'send money', 'send money to', 'send to', 'money to', 'want to send',
+    'help me send', 'i want to', 'would like to', 'need to send',
+    'change the', 'change amount', 'change currency', 'change country',
+    'change delivery', 'change method', 'change beneficiary', 'change name',
+    'change account', 'update the', 'update amount'
+)
+# One compiled alternation finds any excluded phrase in a single scan
+_EXCLUDED_PHRASE_RE = re.compile('|'.join(map(re.escape, _EXCLUDED_PHRASES)))
+
+# Multi-word phrases the name pattern can pick up that are never names
+_NON_NAME_PHRASES = frozenset({'send money', 'bank transfer', 'mobile wallet', 'cash pickup'})
+
+# Name after "to"/"for", and any 1-3 word name
+_PREPOSITION_NAME_RE = re.compile(r'\b(to|for)\s+([A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){0,2})\b', re.IGNORECASE)
+_NAME_RE = re.compile(r'\b([A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){0,2})\b')
+
+
 def extract_beneficiary_name(text: str) -> Optional[str]:
     """Extract beneficiary name from text - handles names in any case without requiring trigger words."""
-    # Common words to exclude
-    excluded_words = {
-        'the', 'a', 'an', 'hello', 'hi', 'hey', 'hola', 'good', 'morning', 
-        'afternoon', 'evening', 'night', 'thanks', 'thank', 'please', 
-        'yes', 'no', 'ok', 'okay', 'sure', 'alright', 'send', 'money',
-        'dollars', 'pesos', 'usd', 'mxn', 'cop', 'hnl', 'dop', 'nio', 'gtq',
-        'bank', 'transfer', 'card', 'wallet', 'pickup', 'cash', 'mobile',
-        'mexico', 'honduras', 'colombia', 'nicaragua', 'guatemala', 'salvador',
-        'dominican', 'republic', 'change', 'update', 'amount', 'currency',
-        'to', 'for', 'with', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
-        'someone', 'somebody', 'person', 'recipient', 'beneficiary',
-        'actually', 'really', 'just', 'want', 'like', 'need'
-    }
-    
-    # Exclude common phrases that might be mistaken for names
-    excluded_phrases = [
-        'send money', 'send money to', 'send to', 'money to', 'want to send',
-        'help me send', 'i want to', 'would like to', 'need to send',
-        'change the', 'change amount', 'change currency', 'change country',
-        'change delivery', 'change method', 'change beneficiary', 'change name',
-        'change account', 'update the', 'update amount'
-    ]
-    
     # First check if text contains excluded phrases - if so, don't extract names
-    text_lower = text.lower()
-    for phrase in excluded_phrases:
-        if phrase in text_lower:
-            # If the text is mostly excluded phrases, don't extract a name
-            # This prevents "send money to" from being extracted as a name
-            return None
+    text_lower = _normalize(text).lower
+    if _EXCLUDED_PHRASE_RE.search(text_lower):
+        # If the text is mostly excluded phrases, don't extract a name
+        # This prevents "send money to" from being extracted as a name
+        return None
     
     # First, try to find names after common prepositions (to, for, etc.)
     # Pattern: "to [name]" or "for [name]"
-    preposition_pattern = r'\b(to|for)\s+([A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){0,2})\b'
-    preposition_matches = re.finditer(preposition_pattern, text, re.IGNORECASE)
+    preposition_matches = _PREPOSITION_NAME_RE.finditer(text)
     for match in preposition_matches:
         name = match.group(2).strip()  # Get the name part, not the preposition
         name_lower = name.lower()
         name_words = name_lower.split()
         
         # Skip if the name itself contains excluded words (other than the preposition we already removed)
-        if any(word in excluded_words for word in name_words):
+        if any(word in _EXCLUDED_WORDS for word in name_words):
             continue
         
         # Skip if it's a country name
-        if name.upper() in COUNTRY_CURRENCY_MAP:
+        if name.upper() in COUNTRY_NAMES:
             continue
         
         # Skip if it looks like a currency code
-        if len(name) == 3 and name.isupper() and name in CURRENCY_NAMES:
+        if len(name) == 3 and name.isupper() and name in CURRENCY_CODES:
             continue
         
         # Skip if it's a number
-        if name.replace(' ', '').isdigit():
+        if _DIGITS_AND_SPACES_RE.fullmatch(name):
             continue
         
         # Skip if it contains numbers
-        if re.search(r'\d', name):
+        if _DIGIT_RE.search(name):
             continue
         
         # This looks like a valid name after a preposition
@@ -226,9 +430,7 @@ def extract_beneficiary_name(text: str) -> Optional[str]:
     # Look for name patterns - words that look like names (2+ letters, not all caps unless it's a short word)
     # Pattern: One or more words, each with 2+ letters
     # Accept: "john", "John", "JOHN", "john smith", "John Smith", "JOHN SMITH", "john smith garcia"
-    pattern = r'\b([A-Za-z]{2,}(?:\s+[A-Za-z]{2,}){0,2})\b'
-    
-    matches = re.finditer(pattern, text)
+    matches = _NAME_RE.finditer(text)
     for match in matches:
         name = match.group(1).strip()
         name_lower = name.lower()
@@ -236,15 +438,15 @@ def extract_beneficiary_name(text: str) -> Optional[str]:
         
         # If the name contains excluded words, try to extract just the name part
         # by removing excluded words from the beginning and end
-        if any(word in excluded_words for word in name_words):
+        if any(word in _EXCLUDED_WORDS for word in name_words):
             # Try to clean the name by removing excluded words from edges
-            cleaned_words = [w for w in name_words if w not in excluded_words]
+            cleaned_words = [w for w in name_words if w not in _EXCLUDED_WORDS]
             if cleaned_words:
                 # Reconstruct the name with original capitalization
                 original_words = name.split()
                 cleaned_name_parts = []
                 for orig_word in original_words:
-                    if orig_word.lower() not in excluded_words:
+                    if orig_word.lower() not in _EXCLUDED_WORDS:
                         cleaned_name_parts.append(orig_word)
                 if cleaned_name_parts:
                     name = ' '.join(cleaned_name_parts)
@@ -256,23 +458,23 @@ def extract_beneficiary_name(text: str) -> Optional[str]:
                 continue
         
         # Skip if it's an excluded word (single word check)
-        if name_lower in excluded_words:
+        if name_lower in _EXCLUDED_WORDS:
             continue
         
         # Skip if it contains excluded phrases
-        if any(phrase in name_lower for phrase in excluded_phrases):
+        if _EXCLUDED_PHRASE_RE.search(name_lower):
             continue
         
         # Skip if it's a country name
-        if name.upper() in COUNTRY_CURRENCY_MAP:
+        if name.upper() in COUNTRY_NAMES:
             continue
         
         # Skip if it looks like a currency code (3 letters all caps)
-        if len(name) == 3 and name.isupper() and name in CURRENCY_NAMES:
+        if len(name) == 3 and name.isupper() and name in CURRENCY_CODES:
             continue
         
         # Skip if it's a number
-        if name.replace(' ', '').isdigit():
+        if _DIGITS_AND_SPACES_RE.fullmatch(name):
             continue
         
         # Skip single letters or very short words
@@ -280,11 +482,11 @@ def extract_beneficiary_name(text: str) -> Optional[str]:
             continue
         
         # Skip if it contains numbers (likely not a name)
-        if re.search(r'\d', name):
+        if _DIGIT_RE.search(name):
             continue
         
         # Skip common phrases that might match
-        if name_lower in ['send money', 'bank transfer', 'mobile wallet', 'cash pickup']:
+        if name_lower in _NON_NAME_PHRASES:
             continue
         
         # Return the first valid name found (preserve original case)
@@ -293,56 +495,56 @@ def extract_beneficiary_name(text: str) -> Optional[str]:
     return None
 
 
+# All keywords in one alternation (longest first), one named group per method
+_DELIVERY_METHOD_RE, _DELIVERY_METHOD_RANKS = _keyed_alternation(
+    {
+        method: sorted((keyword for keyword, m in _DELIVERY_METHOD_MAP.items() if m == method), key=len, reverse=True)
+        for method in dict.fromkeys(_DELIVERY_METHOD_MAP.values())
+    },
+    word_bounded=False,
+)
+
+
+@_memoized_on(_stripped_lower)
 def extract_delivery_method(text: str) -> Optional[str]:
     """Extract delivery method from text."""
-    text_lower = text.lower()
-    
-    method_map = {
-        'bank transfer': 'Bank Transfer',
-        'wire transfer': 'Bank Transfer',
-        'bank': 'Bank Transfer',
-        'wire': 'Bank Transfer',
-        'mobile wallet': 'Mobile Wallet',
-        'wallet': 'Mobile Wallet',
-        'mobile': 'Mobile Wallet',
-        'cash pickup': 'Cash Pickup',
-        'pickup': 'Cash Pickup',
-        'cash': 'Cash Pickup',
-        'card': 'Card',
-        'debit card': 'Card',
-        'credit card': 'Card'
-    }
-    
-    for key, method in method_map.items():
-        if key in text_lower:
-            return method
-    
-    return None
+    # Keywords match anywhere in the text; the method listed first wins, all in one scan
+    return _first_keyed_match(_DELIVERY_METHOD_RE, _DELIVERY_METHOD_RANKS, _normalize(text).lower)
+
+
+# Expected format per field, built once; read-only since every caller shares it
+_EXPECTED_FORMATS = MappingProxyType({
+    'amount': 'a number (e.g., "100", "$100", "100.50")',
+    'currency': 'a currency code or name. Supported: USD, MXN, HNL, DOP, NIO, COP, GTQ (or "dollars", "pesos", "quetzales", etc.)',
+    'country': 'one of: ' + _SUPPORTED_COUNTRIES_STR,
+    'beneficiary_account': 'an account number (e.g., "ACC-123456", "AC12629233", or just the number like "12629233")',
+    'beneficiary_name': 'a person\'s name (e.g., "John Smith", "Maria Garcia")',
+    'delivery_method': 'one of: Bank Transfer, Mobile Wallet, Cash Pickup, or Card',
+})
 
 
-def get_expected_formats() -> dict:
+def get_expected_formats() -> Mapping[str, str]:
     """Get expected formats for each field to show in error messages."""
-    return {
-        'amount': 'a number (e.g., "100", "$100", "100.50")',
-        'currency': 'a currency code or name. Supported: USD, MXN, HNL, DOP, NIO, COP, GTQ (or "dollars", "pesos", "quetzales", etc.)',
-        'country': 'one of: ' + ', '.join(sorted(COUNTRY_CURRENCY_MAP.keys())),
-        'beneficiary_account': 'an account number (e.g., "ACC-123456", "AC12629233", or just the number like "12629233")',
-        'beneficiary_name': 'a person\'s name (e.g., "John Smith", "Maria Garcia")',
-        'delivery_method': 'one of: Bank Transfer, Mobile Wallet, Cash Pickup, or Card',
-    }
+    return _EXPECTED_FORMATS
+
+
+def classify_token(token: str) -> Optional[Literal['country', 'currency']]:
+    """Classify an upper-cased token as a supported country name or currency code."""
+    return _TOKEN_KINDS.get(token)
+
 
 def validate_country_value(country: str) -> tuple[bool, Optional[str]]:
     """Validate country and return (is_valid, error_message)."""
     country_upper = country.upper()
-    if country_upper in COUNTRY_CURRENCY_MAP:
+    if country_upper in COUNTRY_NAMES:
         return True, None
     
     # Check for close matches
     for valid_country in COUNTRY_CURRENCY_MAP.keys():
         if country_upper in valid_country or valid_country in country_upper:
-            return False, f"Did you mean '{valid_country}'? Supported countries are: {', '.join(sorted(COUNTRY_CURRENCY_MAP.keys()))}"
+            return False, f"Did you mean '{valid_country}'? Supported countries are: {_SUPPORTED_COUNTRIES_STR}"
     
-    return False, f"'{country}' is not a supported country. Supported countries are: {', '.join(sorted(COUNTRY_CURRENCY_MAP.keys()))}"
+    return False, f"'{country}' is not a supported country. Supported countries are: {_SUPPORTED_COUNTRIES_STR}"
 
 
 def validate_currency_value(currency: str) -> tuple[bool, Optional[str]]:
@@ -351,57 +553,46 @@ def validate_currency_value(currency: str) -> tuple[bool, Optional[str]]:
     currency_lower = currency.lower()
     
     # Check if it's a valid currency code
-    if currency_upper in CURRENCY_NAMES:
+    if currency_upper in CURRENCY_CODES:
         return True, None
     
     # Check if it matches any currency name
-    for code, names in CURRENCY_NAMES.items():
-        if currency_lower in names:
-            return True, None
+    if _NAME_TO_CODE.get(currency_lower):
+        return True, None
     
-    # Get supported currencies from COUNTRY_CURRENCY_MAP
-    supported_currencies = sorted(set(COUNTRY_CURRENCY_MAP.values()))
-    supported = ', '.join(supported_currencies)
-    return False, f"'{currency}' is not a supported currency. Supported currencies are: {supported}"
+    # Supported currencies come from COUNTRY_CURRENCY_MAP
+    return False, f"'{currency}' is not a supported currency. Supported currencies are: {_SUPPORTED_CURRENCIES_STR}"
 
 
 def validate_delivery_method_value(method: str) -> tuple[bool, Optional[str]]:
     """Validate delivery method and return (is_valid, error_message)."""
     method_lower = method.lower()
     
-    valid_methods = {
-        'bank transfer': 'Bank Transfer',
-        'wire transfer': 'Bank Transfer',
-        'bank': 'Bank Transfer',
-        'wire': 'Bank Transfer',
-        'mobile wallet': 'Mobile Wallet',
-        'wallet': 'Mobile Wallet',
-        'mobile': 'Mobile Wallet',
-        'cash pickup': 'Cash Pickup',
-        'pickup': 'Cash Pickup',
-        'cash': 'Cash Pickup',
-        'card': 'Card',
-        'debit card': 'Card',
-        'credit card': 'Card'
-    }
-    
-    if method_lower in valid_methods:
+    if method_lower in _DELIVERY_METHOD_MAP:
         return True, None
     
     supported = 'Bank Transfer, Mobile Wallet, Cash Pickup, or Card'
     return False, f"'{method}' is not a supported delivery method. Supported methods are: {supported}"
 
 
+# "change [the] <field> [to] <value>", and a leading "to"/"the" left on the value
+_CHANGE_RE = re.compile(r'change(?:\s+the)?\s+(\w+)(?:\s+to\s+)?(.+)?')
+_LEADING_FILLER_RE = re.compile(r'^(to|the)\s+', re.IGNORECASE)
+
+
+@_memoized_on(_stripped_lower)
 def detect_correction(text: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Detect if user is making a correction and what field they're correcting.
     Returns (field_name, value_text) or (None, None).
     """
-    text_lower = text.lower()
+    text_lower = _normalize(text).lower
+    if 'change' not in text_lower:
+        return None, None
     
     # Pattern: "change [the] [field] to [value]" or "change [the] [field] [value]"
     # Handles: "change amount to 300", "change the amount to 300", "change amount 300"
-    change_pattern = re.search(r'change(?:\s+the)?\s+(\w+)(?:\s+to\s+)?(.+)?', text_lower)
+    change_pattern = _CHANGE_RE.search(text_lower)
     if change_pattern:
         field_word = change_pattern.group(1)
         value_text = change_pattern.group(2) if change_pattern.group(2) else None
@@ -423,7 +614,7 @@ def detect_correction(text: str) -> Tuple[Optional[str], Optional[str]]:
             if value_text:
                 value_text = value_text.strip()
                 # Remove leading words like "to", "the", etc. if they're at the start
-                value_text = re.sub(r'^(to|the)\s+', '', value_text, flags=re.IGNORECASE)
+                value_text = _LEADING_FILLER_RE.sub('', value_text)
             return field_mapping[field_word], value_text if value_text else None
     
     return None, None